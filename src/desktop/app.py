@@ -6,13 +6,21 @@ Final functional desktop GUI for Academic Stress EWS.
 import os
 import json
 import traceback
+import threading
+from functools import lru_cache
+from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox
 import joblib
 import numpy as np
+import pandas as pd
 
-MODEL_PATH = "/Users/aryansahoo/Documents/Academic_Stress_EWS_Project/models/logistic_pipeline.joblib"
-FEATURES_PATH = "/Users/aryansahoo/Documents/Academic_Stress_EWS_Project/models/feature_names.json"
+# repo root (src/desktop/app.py -> up 3 levels); either path can be overridden from the environment
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+MODEL_PATH = os.environ.get("MODEL_PATH", str(PROJECT_ROOT / "models" / "logistic_pipeline.joblib"))
+FEATURES_PATH = os.environ.get("FEATURES_PATH", str(PROJECT_ROOT / "models" / "feature_names.json"))
+# last successfully predicted inputs, restored into the form on the next launch
+LAST_INPUTS_PATH = os.path.expanduser("~/.aews_last.json")
 
 REQUIRED_FEATURES = [
     "school", "sex", "age", "address", "famsize", "Pstatus", "Medu", "Fedu",
@@ -23,7 +31,8 @@ REQUIRED_FEATURES = [
 ]
 
 try:
-    MODEL = joblib.load(MODEL_PATH)
+    # memory-mapped arrays share page cache with other processes loading the same file
+    MODEL = joblib.load(MODEL_PATH, mmap_mode="r")
 except Exception as e:
     raise RuntimeError(f"Failed to load model at: {MODEL_PATH}\n\n{e}")
 
@@ -38,45 +47,70 @@ if os.path.exists(FEATURES_PATH):
 else:
     FEATURE_ORDER = REQUIRED_FEATURES.copy()
 
+# preprocessing prefix and final estimator, so transformed rows can be cached
+PRE = MODEL[:-1]
+CLF = MODEL[-1]
+# float32 weights, matching the float32 rows cached by _transform; kept float64 if a
+# probe row's probabilities move. astype replaces the memory-mapped coef_/intercept_
+# with private copies, which is fine for one weight vector.
+if hasattr(CLF, "coef_"):
+    _probe = np.ones((1, CLF.coef_.shape[1]), dtype=np.float32)
+    _before = CLF.predict_proba(_probe)
+    _coef, _intercept = CLF.coef_, CLF.intercept_
+    CLF.coef_, CLF.intercept_ = _coef.astype(np.float32), _intercept.astype(np.float32)
+    if not np.allclose(CLF.predict_proba(_probe), _before):
+        CLF.coef_, CLF.intercept_ = _coef, _intercept
 
-# ---------------- FRIENDLY LABELS & OPTIONS ----------------
 
-FIELD_INFO = [
-    ("school", "School", {"GP": "GP", "MS": "MS"}),
-    ("sex", "Sex", {"F": "F", "M": "M"}),
-    ("age", "Age", None),
-    ("address", "Address", {"U (urban)": "U", "R (rural)": "R"}),
-    ("famsize", "Family Size", {"GT3 (>=3)": "GT3", "LE3 (<3)": "LE3"}),
-    ("Pstatus", "Parent Cohabitation", {"T (together)": "T", "A (apart)": "A"}),
-    ("Medu", "Mother's Education", {"0 - None": 0, "1 - Primary": 1, "2 - 5th–9th": 2, "3 - Secondary": 3, "4 - Higher": 4}),
-    ("Fedu", "Father's Education", {"0 - None": 0, "1 - Primary": 1, "2 - 5th–9th": 2, "3 - Secondary": 3, "4 - Higher": 4}),
-    ("Mjob", "Mother's Job", {"teacher": "teacher", "health": "health", "services": "services", "at_home": "at_home", "other": "other"}),
-    ("Fjob", "Father's Job", {"teacher": "teacher", "health": "health", "services": "services", "at_home": "at_home", "other": "other"}),
-    ("reason", "Reason for School Choice", {"home": "home", "reputation": "reputation", "course": "course", "other": "other"}),
-    ("guardian", "Guardian", {"mother": "mother", "father": "father", "other": "other"}),
-    ("traveltime", "Travel Time", {"1 - <15 min": 1, "2 - 15–30 min": 2, "3 - 30–60 min": 3, "4 - >60 min": 4}),
-    ("studytime", "Weekly Study Time", {"1 - <2 hrs": 1, "2 - 2–5 hrs": 2, "3 - 5–10 hrs": 3, "4 - >10 hrs": 4}),
-    ("failures", "Past Failures", {"0": 0, "1": 1, "2": 2, "3": 3}),
-    ("schoolsup", "School Support", {"yes": 1, "no": 0}),
-    ("famsup", "Family Support", {"yes": 1, "no": 0}),
-    ("paid", "Paid Classes", {"yes": 1, "no": 0}),
-    ("activities", "Activities", {"yes": 1, "no": 0}),
-    ("nursery", "Nursery", {"yes": 1, "no": 0}),
-    ("higher", "Wants Higher Edu", {"yes": 1, "no": 0}),
-    ("internet", "Internet", {"yes": 1, "no": 0}),
-    ("romantic", "Romantic", {"yes": 1, "no": 0}),
-    ("famrel", "Family Relationship", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
-    ("freetime", "Free Time", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
-    ("goout", "Going Out", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
-    ("Dalc", "Workday Alcohol", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
-    ("Walc", "Weekend Alcohol", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
-    ("health", "Health", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
-    ("absences", "Absences", None),
-    ("G1", "G1 (0–20)", None),
-    ("G2", "G2 (0–20)", None),
-]
+# ---------------- FRIENDLY LABELS & OPTIONS ----------------
 
-FIELD_INFO_MAP = {feat: (label, opts) for feat, label, opts in FIELD_INFO}
+FIELD_INFO_MAP = {
+    "school": ("School", {"GP": "GP", "MS": "MS"}),
+    "sex": ("Sex", {"F": "F", "M": "M"}),
+    "age": ("Age", None),
+    "address": ("Address", {"U (urban)": "U", "R (rural)": "R"}),
+    "famsize": ("Family Size", {"GT3 (>=3)": "GT3", "LE3 (<3)": "LE3"}),
+    "Pstatus": ("Parent Cohabitation", {"T (together)": "T", "A (apart)": "A"}),
+    "Medu": ("Mother's Education", {"0 - None": 0, "1 - Primary": 1, "2 - 5th–9th": 2, "3 - Secondary": 3, "4 - Higher": 4}),
+    "Fedu": ("Father's Education", {"0 - None": 0, "1 - Primary": 1, "2 - 5th–9th": 2, "3 - Secondary": 3, "4 - Higher": 4}),
+    "Mjob": ("Mother's Job", {"teacher": "teacher", "health": "health", "services": "services", "at_home": "at_home", "other": "other"}),
+    "Fjob": ("Father's Job", {"teacher": "teacher", "health": "health", "services": "services", "at_home": "at_home", "other": "other"}),
+    "reason": ("Reason for School Choice", {"home": "home", "reputation": "reputation", "course": "course", "other": "other"}),
+    "guardian": ("Guardian", {"mother": "mother", "father": "father", "other": "other"}),
+    "traveltime": ("Travel Time", {"1 - <15 min": 1, "2 - 15–30 min": 2, "3 - 30–60 min": 3, "4 - >60 min": 4}),
+    "studytime": ("Weekly Study Time", {"1 - <2 hrs": 1, "2 - 2–5 hrs": 2, "3 - 5–10 hrs": 3, "4 - >10 hrs": 4}),
+    "failures": ("Past Failures", {"0": 0, "1": 1, "2": 2, "3": 3}),
+    "schoolsup": ("School Support", {"yes": 1, "no": 0}),
+    "famsup": ("Family Support", {"yes": 1, "no": 0}),
+    "paid": ("Paid Classes", {"yes": 1, "no": 0}),
+    "activities": ("Activities", {"yes": 1, "no": 0}),
+    "nursery": ("Nursery", {"yes": 1, "no": 0}),
+    "higher": ("Wants Higher Edu", {"yes": 1, "no": 0}),
+    "internet": ("Internet", {"yes": 1, "no": 0}),
+    "romantic": ("Romantic", {"yes": 1, "no": 0}),
+    "famrel": ("Family Relationship", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
+    "freetime": ("Free Time", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
+    "goout": ("Going Out", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
+    "Dalc": ("Workday Alcohol", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
+    "Walc": ("Weekend Alcohol", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
+    "health": ("Health", {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}),
+    "absences": ("Absences", None),
+    "G1": ("G1 (0–20)", None),
+    "G2": ("G2 (0–20)", None),
+}
+
+# one-row model input reused for every prediction (string columns object, rest int64)
+STR_FEATURES = {feat for feat, (_, opts) in FIELD_INFO_MAP.items()
+                if opts and isinstance(next(iter(opts.values())), str)}
+_X_BUF = pd.DataFrame(
+    [[None if f in STR_FEATURES else 0 for f in FEATURE_ORDER]], columns=FEATURE_ORDER
+).astype({f: object if f in STR_FEATURES else np.int64 for f in FEATURE_ORDER})
+_X_BUF_LOCK = threading.Lock()
+
+# mapped form values, written in place by gather_and_map_inputs at each feature's position
+_FEAT_IDX = {f: i for i, f in enumerate(FEATURE_ORDER)}
+_ROW = np.empty(len(FEATURE_ORDER), dtype=object)
+_INT64 = np.iinfo(np.int64)
 
 
 # ---------------- UI BUILD ----------------
@@ -100,68 +134,132 @@ branding.pack(anchor="nw", pady=(6, 12))
 
 # ---------------- FIXED SCROLLABLE AREA (no black section) ----------------
 
+# Rows are virtualized: every field keeps its tk variables, but widgets only
+# exist for the rows currently in view and are pooled and rebound on scroll.
+ROW_HEIGHT = 72
+
 canvas = tk.Canvas(left, highlightthickness=0, bg="white")
 scrollbar = ttk.Scrollbar(left, orient="vertical", command=canvas.yview)
 
-form_frame = ttk.Frame(canvas)
-
-canvas.create_window((0, 0), window=form_frame, anchor="nw")
-canvas.configure(yscrollcommand=scrollbar.set)
 scrollbar.pack(side="right", fill="y")
 canvas.pack(side="left", fill="both", expand=False)   # << The key fix
 
-def _on_frame_configure(event):
-    canvas.configure(scrollregion=canvas.bbox("all"))
-    canvas.config(height=min(form_frame.winfo_height(), 600))  # dynamically shrink
-
-form_frame.bind("<Configure>", _on_frame_configure)
-
 
 # ---------------- FORM ELEMENTS ----------------
 
+def safe_cast_int(x):
+    s = x.strip() if isinstance(x, str) else x
+    # plain integer strings (the spinbox common case) skip the float round-trip
+    if isinstance(s, str) and (s[1:] if s[:1] == "-" else s).isdecimal():
+        return int(s)
+    try:
+        return int(float(s))
+    except:
+        return None
+
+# feature -> (kind, var, ((label, value), ...) or (min, max), selected index var or None, reset value)
 widget_vars = {}
-error_labels = {}
-
-def add_dropdown(parent, feature, label_text, options_map):
-    frame = ttk.Frame(parent)
-    frame.pack(fill="x", pady=6, padx=6)
-    ttk.Label(frame, text=label_text).pack(anchor="w")
-    var = tk.StringVar()
-    combo = ttk.Combobox(frame, textvariable=var, values=list(options_map.keys()),
-                         state="readonly", width=44)
-    combo.pack(anchor="w")
-    combo.set(list(options_map.keys())[0])
-    widget_vars[feature] = ("dropdown", var, options_map)
-    err = ttk.Label(frame, text="", foreground="red")
-    err.pack(anchor="w")
-    error_labels[feature] = err
-
-def add_spinbox(parent, feature, label_text, minval, maxval):
-    frame = ttk.Frame(parent)
-    frame.pack(fill="x", pady=6, padx=6)
-    ttk.Label(frame, text=label_text).pack(anchor="w")
-    var = tk.StringVar()
-    spin = tk.Spinbox(frame, from_=minval, to=maxval, textvariable=var, width=10)
-    spin.pack(anchor="w")
-    var.set(str(minval))
-    widget_vars[feature] = ("spin", var, (minval, maxval))
-    err = ttk.Label(frame, text="", foreground="red")
-    err.pack(anchor="w")
-    error_labels[feature] = err
+error_vars = {}
+# the same widgets split by kind, in FEATURE_ORDER, for the bulk read in gather_and_map_inputs
+_DROPDOWN_VARS = []  # (feature, selected index var, ((label, value), ...))
+_NUMERIC_VARS = []   # (feature, var)
+
+_ROW_SPECS = []   # (feature, pool key, label text, var, option labels or (min, max)), in display order
+_row_pool = {}    # pool key -> released rows ready for reuse
+_realized = {}    # row index -> (pool key, row)
+_combo_field = {} # realized Combobox -> feature it currently shows
+
+def add_dropdown(feature, label_text, options_map):
+    options = tuple(options_map.items())
+    keys = [label for label, _ in options]
+    var = tk.StringVar(value=keys[0])
+    index = tk.IntVar(value=0)
+    widget_vars[feature] = ("dropdown", var, options, index, keys[0])
+    _DROPDOWN_VARS.append((feature, index, options))
+    error_vars[feature] = tk.StringVar()
+    _ROW_SPECS.append((feature, ("dropdown",), label_text, var, keys))
+
+def add_spinbox(feature, label_text, minval, maxval):
+    var = tk.StringVar(value=str(minval))
+    widget_vars[feature] = ("spin", var, (minval, maxval), None, str(minval))
+    _NUMERIC_VARS.append((feature, var))
+    error_vars[feature] = tk.StringVar()
+    # spinboxes are pooled per range: changing from_/to on a live widget clamps its value
+    _ROW_SPECS.append((feature, ("spin", minval, maxval), label_text, var, (minval, maxval)))
+
+def _on_combo_selected(event):
+    # keep the selected position, so submit indexes the option tuple directly
+    widget_vars[_combo_field[event.widget]][3].set(event.widget.current())
+
+def _make_row(key):
+    frame = ttk.Frame(canvas)
+    label = ttk.Label(frame)
+    if key[0] == "dropdown":
+        widget = ttk.Combobox(frame, state="readonly", width=44)
+        widget.bind("<<ComboboxSelected>>", _on_combo_selected)
+    else:
+        widget = tk.Spinbox(frame, from_=key[1], to=key[2], width=10)
+    err = ttk.Label(frame, foreground="red")
+    for r, w in enumerate((label, widget, err)):
+        w.grid(row=r, column=0, sticky="w")
+    window = canvas.create_window(6, 0, window=frame, anchor="nw", state="hidden")
+    return frame, label, widget, err, window
+
+def _realize_row(i):
+    feature, key, label_text, var, extra = _ROW_SPECS[i]
+    pool = _row_pool.setdefault(key, [])
+    row = pool.pop() if pool else _make_row(key)
+    _, label, widget, err, window = row
+    label.config(text=label_text)
+    if key[0] == "dropdown":
+        widget.config(values=extra, textvariable=var)
+        _combo_field[widget] = feature
+    else:
+        widget.config(textvariable=var)
+    err.config(textvariable=error_vars[feature])
+    canvas.coords(window, 6, i * ROW_HEIGHT + 6)
+    canvas.itemconfigure(window, state="normal")
+    _realized[i] = (key, row)
+
+def _release_row(i):
+    key, row = _realized.pop(i)
+    canvas.itemconfigure(row[4], state="hidden")
+    _row_pool[key].append(row)
+
+def _refresh_visible(*_):
+    top = canvas.canvasy(0)
+    first = max(int(top // ROW_HEIGHT), 0)
+    last = min(int((top + canvas.winfo_height()) // ROW_HEIGHT) + 1, len(_ROW_SPECS))
+    for i in [i for i in _realized if not first <= i < last]:
+        _release_row(i)
+    for i in range(first, last):
+        if i not in _realized:
+            _realize_row(i)
+
+def _on_yscroll(first, last):
+    scrollbar.set(first, last)
+    _refresh_visible()
+
+canvas.configure(yscrollcommand=_on_yscroll)
+canvas.bind("<Configure>", _refresh_visible)
 
 for feat in FEATURE_ORDER:
     label, opts = FIELD_INFO_MAP.get(feat, (feat, None))
     if opts is None:
         if feat == "age":
-            add_spinbox(form_frame, feat, label, 10, 30)
+            add_spinbox(feat, label, 10, 30)
         elif feat == "absences":
-            add_spinbox(form_frame, feat, label, 0, 93)
+            add_spinbox(feat, label, 0, 93)
         elif feat in ("G1", "G2"):
-            add_spinbox(form_frame, feat, label, 0, 20)
+            add_spinbox(feat, label, 0, 20)
         else:
-            add_spinbox(form_frame, feat, label, 0, 100)
+            add_spinbox(feat, label, 0, 100)
     else:
-        add_dropdown(form_frame, feat, label, opts)
+        add_dropdown(feat, label, opts)
+
+form_height = len(_ROW_SPECS) * ROW_HEIGHT
+canvas.configure(scrollregion=(0, 0, canvas.winfo_reqwidth(), form_height),
+                 height=min(form_height, 600))
 
 
 # ---------------- OUTPUT PANEL ----------------
@@ -181,77 +279,121 @@ ttk.Label(right, textvariable=prob_var, font=("Helvetica", 12)).pack(anchor="w",
 
 # ---------------- LOGIC ----------------
 
-def safe_cast_int(x):
-    try:
-        return int(float(x))
-    except:
-        return None
-
 def gather_and_map_inputs():
-    errors, mapped = {}, {}
-    for feat in FEATURE_ORDER:
-        t, var, extra = widget_vars[feat]
-        if t == "dropdown":
-            val = var.get()
-            mapped_val = extra.get(val)
-            if mapped_val is None:
-                errors[feat] = "Choose a valid option"
-            else:
-                mapped[feat] = mapped_val
-
-        else:
-            val = var.get()
-            val_i = safe_cast_int(val)
-            if val_i is None:
-                errors[feat] = "Enter a number"
-            else:
-                mapped[feat] = val_i
+    errors = {}
+    drop_vals = [options[index.get()][1] for _, index, options in _DROPDOWN_VARS]
+    try:
+        num_vals = np.fromiter((var.get() for _, var in _NUMERIC_VARS),
+                               dtype=np.int64, count=len(_NUMERIC_VARS)).tolist()
+    except (ValueError, OverflowError):
+        # slow path: find the bad fields (safe_cast_int also accepts e.g. "17.0");
+        # values that don't fit the int64 model input are rejected as well
+        num_vals = [v if v is not None and _INT64.min <= v <= _INT64.max else None
+                    for v in (safe_cast_int(var.get()) for _, var in _NUMERIC_VARS)]
+
+    for (feat, _, _), val in zip(_DROPDOWN_VARS, drop_vals):
+        _ROW[_FEAT_IDX[feat]] = val
+    for (feat, _), val in zip(_NUMERIC_VARS, num_vals):
+        if val is None:
+            errors[feat] = "Enter a number"
+        _ROW[_FEAT_IDX[feat]] = val
 
     if errors:
         return False, errors
 
-    return True, [mapped[f] for f in FEATURE_ORDER]
+    # shared buffer: overwritten by the next call, so callers copy it (e.g. tuple(payload))
+    return True, _ROW
+
+
+@lru_cache(maxsize=1024)
+def _transform(features_tuple):
+    with _X_BUF_LOCK:
+        for i, val in enumerate(features_tuple):
+            _X_BUF.iat[0, i] = val
+        Xp = np.ascontiguousarray(PRE.transform(_X_BUF), dtype=np.float32)
+    Xp.flags.writeable = False  # shared by every cache hit
+    return Xp
+
+@lru_cache(maxsize=512)
+def _cached_predict(features_tuple):
+    Xp = _transform(features_tuple)
+    try:
+        proba = CLF.predict_proba(Xp)[0]
+    except Exception:
+        return int(CLF.predict(Xp)[0]), None
+    # same decision rule as LogisticRegression.predict, without a second pipeline pass
+    return int(proba[1] > 0.5), float(proba[1])
 
 
 def predict_action():
-    for e in error_labels.values():
-        e.config(text="")
+    for e in error_vars.values():
+        e.set("")
 
     ok, payload = gather_and_map_inputs()
     if not ok:
         for feat, msg in payload.items():
-            error_labels[feat].config(text=msg)
+            error_vars[feat].set(msg)
         messagebox.showerror("Input Error", "Fix the highlighted fields.")
         return
 
     try:
-        import pandas as pd
-        X = pd.DataFrame([payload], columns=FEATURE_ORDER)
-
-        try:
-            prob = float(MODEL.predict_proba(X)[:, 1][0])
-        except:
-            prob = None
-
-        pred = int(MODEL.predict(X)[0])
+        pred, prob = _cached_predict(tuple(payload))
         pred_var.set("1 (High stress)" if pred == 1 else "0 (Low stress)")
         prob_var.set(f"{prob:.4f}" if prob is not None else "N/A")
 
     except Exception as e:
         tb = traceback.format_exc()
         messagebox.showerror("Prediction error", f"{e}\n\n{tb}")
+        return
+
+    try:
+        with open(LAST_INPUTS_PATH, "w") as fh:
+            json.dump(dict(zip(FEATURE_ORDER, payload)), fh)
+    except OSError:
+        pass
 
 
 ttk.Button(right, text="Predict", command=predict_action).pack(pady=20, padx=12)
 
 def clear_form():
-    for feat, (t, var, extra) in widget_vars.items():
+    for feat, (_, var, _, index, default) in widget_vars.items():
+        var.set(default)
+        if index is not None:
+            index.set(0)
+        error_vars[feat].set("")
+
+ttk.Button(right, text="Clear", command=clear_form).pack(pady=(0, 6), padx=12)
+
+def load_last_inputs():
+    try:
+        with open(LAST_INPUTS_PATH, "r") as fh:
+            saved = json.load(fh)
+    except (OSError, ValueError):
+        return
+    if not isinstance(saved, dict):
+        return
+    for feat, (t, var, extra, index, _) in widget_vars.items():
+        if feat not in saved:
+            continue
         if t == "dropdown":
-            var.set(list(extra.keys())[0])
+            # stored values are model encodings; show the matching label
+            for i, (label, value) in enumerate(extra):
+                if value == saved[feat]:
+                    var.set(label)
+                    index.set(i)
+                    break
         else:
-            var.set(str(extra[0]))
-        error_labels[feat].config(text="")
+            var.set(str(saved[feat]))
 
-ttk.Button(right, text="Clear", command=clear_form).pack(pady=(0, 6), padx=12)
+load_last_inputs()
+
+# one prediction on the starting form at startup, so the first click doesn't pay
+# for sklearn/BLAS first-call setup (a failure here surfaces on Predict instead)
+try:
+    _ok, _payload = gather_and_map_inputs()
+    if _ok:
+        _cached_predict(tuple(_payload))
+except Exception:
+    pass
 
 root.mainloop()
@@ -1,9 +1,15 @@
 # src/streamlit/app.py
 import os
+import io
 import json
+import math
+import tempfile
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any
 import joblib
+from joblib import Memory
 import numpy as np
 import pandas as pd
 import streamlit as st
@@ -19,23 +25,108 @@ MODELS_DIR = PROJECT_ROOT / "models"
 MODEL_PATH = MODELS_DIR / "logistic_pipeline.joblib"
 FEATURES_JSON = MODELS_DIR / "feature_names.json"
 
+# on-disk memo of the loaded artifacts; arrays are memory-mapped on reload
+# so several Streamlit processes share the same pages. AEWS_CACHE_DIR overrides
+# the location, which defaults to the system temp dir rather than the checkout.
+CACHE_DIR = Path(os.environ.get("AEWS_CACHE_DIR", Path(tempfile.gettempdir()) / "academic_stress_ews"))
+
 # -----------------------
 # load model + feature order
 # -----------------------
+def _prewarm(model_path: str, features_path: str, model_mtime: float, features_mtime: float):
+    # the mtimes are only part of the cache key, so a retrained model or an edited
+    # feature file invalidates it. joblib.Memory also hashes this function's source,
+    # but not helpers it calls: keep the post-load steps inline here, or clear CACHE_DIR
+    model = joblib.load(model_path)
+    with open(features_path, "r") as fh:
+        feature_order = json.load(fh)
+    # float32 weights, matching the float32 rows cached by _transform; kept float64
+    # if a probe row's probabilities move
+    clf = model[-1]
+    if hasattr(clf, "coef_"):
+        probe = np.ones((1, clf.coef_.shape[1]), dtype=np.float32)
+        before = clf.predict_proba(probe)
+        coef, intercept = clf.coef_, clf.intercept_
+        clf.coef_, clf.intercept_ = coef.astype(np.float32), intercept.astype(np.float32)
+        if not np.allclose(clf.predict_proba(probe), before):
+            clf.coef_, clf.intercept_ = coef, intercept
+    return model, feature_order, model[:-1], clf
+
 @st.cache_resource(show_spinner=False)
 def load_artifacts(model_path: Path, features_path: Path):
     if not model_path.exists():
         raise FileNotFoundError(f"Model not found at: {model_path}")
+    if not features_path.exists():
+        raise FileNotFoundError(f"feature_names.json not found at {features_path}")
 
-    model = joblib.load(model_path)
+    args = (str(model_path), str(features_path),
+            model_path.stat().st_mtime, features_path.stat().st_mtime)
+    try:
+        artifacts = Memory(CACHE_DIR, mmap_mode="r", verbose=0).cache(_prewarm)(*args)
+    except OSError:
+        # cache dir not writable (e.g. read-only container): load without the disk memo
+        artifacts = _prewarm(*args)
 
-    if features_path.exists():
-        with open(features_path, "r") as fh:
-            feature_order = json.load(fh)
-    else:
-        raise FileNotFoundError(f"feature_names.json not found at {features_path}")
+    return artifacts
+
+@st.cache_resource(show_spinner=False)
+def load_predictor(model_path: Path, features_path: Path, str_features: frozenset, warmup_row: tuple):
+    # built once per process so the transform cache survives script reruns
+    _, feature_order, pre, clf = load_artifacts(model_path, features_path)
+
+    # one-row model input reused across sessions (string columns object, rest int64)
+    x_buf = pd.DataFrame(
+        [[None if f in str_features else 0 for f in feature_order]], columns=feature_order
+    ).astype({f: object if f in str_features else np.int64 for f in feature_order})
+    x_buf_lock = threading.Lock()
+
+    @lru_cache(maxsize=1024)
+    def _transform(features_tuple):
+        with x_buf_lock:
+            for i, val in enumerate(features_tuple):
+                x_buf.iat[0, i] = val
+            Xp = np.ascontiguousarray(pre.transform(x_buf), dtype=np.float32)
+        Xp.flags.writeable = False  # shared by every cache hit
+        return Xp
+
+    def _predict(features_tuple):
+        Xp = _transform(features_tuple)
+        try:
+            proba = clf.predict_proba(Xp)[0]
+        except Exception:
+            return int(clf.predict(Xp)[0]), None
+        # same decision rule as LogisticRegression.predict, without a second pipeline pass
+        return int(proba[1] > 0.5), float(proba[1])
+
+    # one throwaway prediction on the form's default row, so the first submit doesn't
+    # pay for sklearn/BLAS first-call setup (a failure here surfaces on Predict instead)
+    try:
+        _predict(warmup_row)
+    except Exception:
+        pass
+
+    return _predict
+
+# -----------------------
+# batch scoring: sigmoid(X @ w + b) over already-transformed rows
+# -----------------------
+def _score_rows(Xp, w, b):
+    out = np.empty(Xp.shape[0])
+    for i in range(Xp.shape[0]):
+        s = b
+        for j in range(Xp.shape[1]):
+            s += Xp[i, j] * w[j]
+        out[i] = 1.0 / (1.0 + math.exp(-s))
+    return out
 
-    return model, feature_order
+@st.cache_resource(show_spinner=False)
+def load_batch_scorer():
+    # numba is optional; without it the same computation runs through numpy
+    try:
+        import numba
+    except ImportError:
+        return lambda Xp, w, b: 1.0 / (1.0 + np.exp(-(Xp @ w + b)))
+    return numba.njit(cache=True, fastmath=True)(_score_rows)
 
 # UI starts
 st.set_page_config(page_title="Academic Stress EWS", layout="wide")
@@ -61,7 +152,7 @@ with st.sidebar:
 
 # load artifacts (fail with clear message if missing)
 try:
-    MODEL, FEATURE_ORDER = load_artifacts(MODEL_PATH, FEATURES_JSON)
+    MODEL, FEATURE_ORDER, PRE, CLF = load_artifacts(MODEL_PATH, FEATURES_JSON)
 except Exception as e:
     st.error(f"Failed to load model/features: {e}")
     st.stop()
@@ -73,7 +164,8 @@ REQUIRED = [
     "paid","activities","nursery","higher","internet","romantic","famrel","freetime",
     "goout","Dalc","Walc","health","absences","G1","G2"
 ]
-if not all(f in FEATURE_ORDER for f in REQUIRED):
+MISSING_REQUIRED = [f for f in REQUIRED if f not in FEATURE_ORDER]
+if MISSING_REQUIRED:
     st.warning("Loaded feature order does not exactly match expected required features.")
 
 # -----------------------
@@ -114,6 +206,32 @@ FIELD_INFO = {
     "G2": ("Grade G2 (0–20)", None)
 }
 
+# number_input bounds and starting value: feature -> (min, max, default)
+NUMBER_INPUTS = {
+    "age": (10, 30, 17),
+    "absences": (0, 93, 0),
+    "G1": (0, 20, 10),
+    "G2": (0, 20, 10),
+}
+
+STR_FEATURES = frozenset(
+    feat for feat, (_, opts) in FIELD_INFO.items()
+    if opts and isinstance(next(iter(opts.values())), str)
+)
+# what the form submits before the user changes anything
+DEFAULT_ROW = tuple(
+    next(iter(FIELD_INFO[f][1].values())) if f in FIELD_INFO and FIELD_INFO[f][1]
+    else NUMBER_INPUTS.get(f, (None, None, 0))[2]
+    for f in FEATURE_ORDER
+)
+_predict = load_predictor(MODEL_PATH, FEATURES_JSON, STR_FEATURES, DEFAULT_ROW)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _predict_cached(items_tuple):
+    # keyed on the sorted (feature, value) pairs; shared across reruns and sessions
+    inputs = dict(items_tuple)
+    return _predict(tuple(inputs[f] for f in FEATURE_ORDER))
+
 # -----------------------
 # Build form layout
 # -----------------------
@@ -136,12 +254,9 @@ with st.form(key="input_form", clear_on_submit=False):
         col_index += 1
 
         if opts is None:
-            if feat == "age":
-                val = c.number_input(label, min_value=10, max_value=30, value=17)
-            elif feat == "absences":
-                val = c.number_input(label, min_value=0, max_value=93, value=0)
-            elif feat in ("G1","G2"):
-                val = c.number_input(label, min_value=0, max_value=20, value=10)
+            if feat in NUMBER_INPUTS:
+                lo, hi, default = NUMBER_INPUTS[feat]
+                val = c.number_input(label, min_value=lo, max_value=hi, value=default)
             else:
                 val = c.number_input(label, value=0)
             inputs[feat] = val
@@ -154,27 +269,19 @@ with st.form(key="input_form", clear_on_submit=False):
 # -----------------------
 # Predict
 # -----------------------
-def validate_inputs(inp: Dict[str, Any]) -> List[str]:
-    errs = []
-    for f in REQUIRED:
-        if f not in inp:
-            errs.append(f"Missing {f}")
-    return errs
-
 if submitted:
-    errs = validate_inputs(inputs)
+    # the form fills one input per FEATURE_ORDER entry, so the only possible
+    # gaps are required features missing from FEATURE_ORDER, checked at load
+    errs = [f"Missing {f}" for f in MISSING_REQUIRED]
     if errs:
         st.error("Validation errors: " + "; ".join(errs))
     else:
-        X = pd.DataFrame([inputs], columns=FEATURE_ORDER)
-
         try:
-            prob = float(MODEL.predict_proba(X)[:,1][0])
-            pred = int(MODEL.predict(X)[0])
+            pred, prob = _predict_cached(tuple(sorted(inputs.items())))
 
             col1, col2 = st.columns((1,1))
             col1.metric("Prediction (class)", "High stress (1)" if pred==1 else "Low stress (0)")
-            col2.metric("Probability", f"{prob:.3f}")
+            col2.metric("Probability", f"{prob:.3f}" if prob is not None else "N/A")
 
             st.markdown("#### Input (sent to model)")
             st.json(inputs)
@@ -186,3 +293,46 @@ if submitted:
         except Exception as e:
             st.error(f"Prediction failed: {e}")
             st.exception(e)
+
+# -----------------------
+# Batch prediction (CSV)
+# -----------------------
+st.markdown("## Batch prediction")
+uploaded = st.file_uploader("CSV with one row per student (same columns as the sample dataset)", type="csv")
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _predict_batch(data: bytes):
+    # keyed on the uploaded bytes, so reruns with the same file skip parse/transform/score;
+    # returns (result, csv text, missing columns)
+    batch = pd.read_csv(io.BytesIO(data))
+    missing = [f for f in FEATURE_ORDER if f not in batch.columns]
+    if missing:
+        return None, None, missing
+
+    Xp = np.ascontiguousarray(PRE.transform(batch[FEATURE_ORDER]), dtype=np.float64)
+    if hasattr(CLF, "coef_") and CLF.coef_.shape[0] == 1:
+        w = np.ascontiguousarray(CLF.coef_[0], dtype=np.float64)
+        probs = load_batch_scorer()(Xp, w, float(CLF.intercept_[0]))
+    else:
+        probs = CLF.predict_proba(Xp)[:, 1]
+
+    result = batch.copy()
+    result["stress_probability"] = probs
+    result["stress_prediction"] = (probs > 0.5).astype(int)
+    return result, result.to_csv(index=False), []
+
+if uploaded is not None:
+    try:
+        result, result_csv, missing = _predict_batch(uploaded.getvalue())
+        if missing:
+            st.error("Missing columns: " + ", ".join(missing))
+        else:
+            st.dataframe(result)
+
+            st.download_button("Download predictions CSV",
+                data=result_csv,
+                file_name="stress_predictions.csv"
+            )
+    except Exception as e:
+        st.error(f"Batch prediction failed: {e}")
+        st.exception(e)